@@ -3,96 +3,152 @@
 import numpy as np
 from math import radians, cos, sin
 
-def twist_airfoil_ledge(df, angle_degrees):
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, the NumPy version below is used without it
+    njit = None
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _rotate(x, y, c, s, cx, cy, out_x, out_y):
+        """Rotate the points (x, y) about (cx, cy) into out_x and out_y, with c and s the cosine and sine of the angle."""
+        # Fold the translation to and from the rotation center into one constant per axis
+        k1 = cx - c*cx + s*cy
+        k2 = cy - s*cx - c*cy
+        for i in range(x.shape[0]):
+            out_x[i] = c*x[i] - s*y[i] + k1
+            out_y[i] = s*x[i] + c*y[i] + k2
+else:
+    def _rotate(x, y, c, s, cx, cy, out_x, out_y):
+        """Rotate the points (x, y) about (cx, cy) into out_x and out_y, with c and s the cosine and sine of the angle."""
+        # Fold the translation to and from the rotation center into one constant per axis
+        k1 = cx - c*cx + s*cy
+        k2 = cy - s*cx - c*cy
+        np.multiply(x, c, out=out_x)
+        out_x -= s*y
+        out_x += k1
+        np.multiply(x, s, out=out_y)
+        out_y += c*y
+        out_y += k2
+
+def _as_float(x, y):
+    """Return x and y as arrays, promoting integer coordinates to floating point."""
+    x, y = np.asarray(x), np.asarray(y)
+    return (x.astype(np.result_type(x.dtype, np.float32), copy=False),
+            y.astype(np.result_type(y.dtype, np.float32), copy=False))
+
+def twist_airfoil_ledge(x, y, angle_degrees, out_x=None, out_y=None):
     """
     Twist the airfoil about its leading edge by the specified angle in degrees.
     
     Args:
-        df: pandas DataFrame with X and Y coordinates
+        x, y: Arrays of length N with X and Y coordinates
         angle_degrees: Angle to twist in degrees (positive = clockwise)
+        out_x, out_y: Preallocated arrays of length N for the result. If None, new floating point arrays are allocated
     
     Returns:
-        DataFrame with original and twisted coordinates
+        Tuple of arrays with twisted X and Y coordinates
     """
-    # Make a copy of the dataframe to avoid modifying the original
-    result_df = df.copy()
+    # Accept any array-like coordinates, computing in floating point
+    x, y = _as_float(x, y)
 
     # Convert angle to radians
     angle_rad = radians(angle_degrees)
-    
-    # Create rotation matrix (https://en.wikipedia.org/wiki/Rotation_matrix)
-    rotation_matrix = np.array([
-        [cos(angle_rad), -sin(angle_rad)],
-        [sin(angle_rad), cos(angle_rad)]
-    ])
-    
-    # Apply rotation to each point of data set. Center of leading edge (0,0) is the rotation center.
-    coords = np.column_stack((result_df['X'], result_df['Y']))
-    rotated_coords = np.dot(coords, rotation_matrix.T)
-    
-    # Store the results
-    result_df['X_twisted'] = rotated_coords[:, 0]
-    result_df['Y_twisted'] = rotated_coords[:, 1]
-    
-    return result_df
+    c, s = cos(angle_rad), sin(angle_rad)
+    
+    # Apply rotation to each point of data set (https://en.wikipedia.org/wiki/Rotation_matrix).
+    # Center of leading edge (0,0) is the rotation center.
+    if out_x is None:
+        out_x = np.empty_like(x)
+    if out_y is None:
+        out_y = np.empty_like(y)
+    _rotate(x, y, c, s, 0.0, 0.0, out_x, out_y)
+    return out_x, out_y
 
-def twist_airfoil_centroid(df, angle_degrees):
+def twist_airfoil_centroid(x, y, angle_degrees, centroid=None, out_x=None, out_y=None):
     """
     Twist the airfoil about its centroid by the specified angle in degrees.
     
     Args:
-        df: pandas DataFrame with X and Y coordinates
+        x, y: Arrays of length N with X and Y coordinates
         angle_degrees: Angle to twist in degrees (positive = clockwise)
+        centroid: Precomputed (X, Y) centroid. If None, it is calculated from x and y
+        out_x, out_y: Preallocated arrays of length N for the result. If None, new floating point arrays are allocated
     
     Returns:
-        DataFrame with original and twisted coordinates
+        Tuple of arrays with twisted X and Y coordinates
     """
-    # Make a copy of the dataframe to avoid modifying the original
-    result_df = df.copy()
+    # Accept any array-like coordinates, computing in floating point
+    x, y = _as_float(x, y)
 
     # Calculate centroid
-    centroid_x = result_df['X'].mean()
-    centroid_y = result_df['Y'].mean()
+    cx, cy = (x.mean(dtype=np.float64), y.mean(dtype=np.float64)) if centroid is None else centroid
 
     # Convert angle to radians
     angle_rad = radians(angle_degrees)
+    c, s = cos(angle_rad), sin(angle_rad)
+    
+    # Apply rotation to each point of data set (https://en.wikipedia.org/wiki/Rotation_matrix).
+    # Centroid is the rotation center.
+    if out_x is None:
+        out_x = np.empty_like(x)
+    if out_y is None:
+        out_y = np.empty_like(y)
+    _rotate(x, y, c, s, float(cx), float(cy), out_x, out_y)
+    return out_x, out_y
+
+def twist_airfoil_batch(x, y, angles_degrees, center=(0.0, 0.0)):
+    """
+    Twist the airfoil by several angles at once, e.g. to render a swept-angle animation.
     
-    # Create rotation matrix (https://en.wikipedia.org/wiki/Rotation_matrix)
-    rotation_matrix = np.array([
-        [cos(angle_rad), -sin(angle_rad)],
-        [sin(angle_rad), cos(angle_rad)]
-    ])
-    
-    # Apply rotation to each point of data set. Centroid is the rotation center.
-    coords = np.column_stack((result_df['X']-centroid_x, result_df['Y']-centroid_y))
-    rotated_coords = np.dot(coords, rotation_matrix.T)
-    
-    # Store the results
-    result_df['X_twisted'] = rotated_coords[:, 0] + centroid_x
-    result_df['Y_twisted'] = rotated_coords[:, 1] + centroid_y
+    Args:
+        x, y: Arrays of length N with X and Y coordinates
+        angles_degrees: Angle or array of K angles to twist in degrees (positive = clockwise)
+        center: (X, Y) rotation center. Defaults to the leading edge (0,0)
     
-    return result_df
+    Returns:
+        Tuple of (K, N) arrays with the twisted X and Y coordinates, one row per angle
+    """
+    # Accept any array-like coordinates, computing in floating point
+    x, y = _as_float(x, y)
+    
+    # Convert angles to radians, one column per angle so it broadcasts against the coordinates
+    angles_rad = np.radians(np.atleast_1d(np.asarray(angles_degrees, dtype=np.float64)))
+    c = np.cos(angles_rad).astype(x.dtype)[:, None]
+    s = np.sin(angles_rad).astype(x.dtype)[:, None]
+    
+    # Fold the translation to and from the rotation center into one constant per angle and axis
+    cx, cy = center
+    k1 = cx - c*cx + s*cy
+    k2 = cy - s*cx - c*cy
+    return c*x - s*y + k1, s*x + c*y + k2
 
-def scale_airfoil(df, scale_factor):
+def scale_airfoil(x, y, scale_factor, centroid=None, out_x=None, out_y=None):
     """
     Scale the airfoil by a factor.
     
     Args:
-        df: pandas DataFrame with X and Y coordinates
+        x, y: Arrays of length N with X and Y coordinates
         scale_factor: Factor to scale the airfoil by
+        centroid: Precomputed (X, Y) centroid. If None, it is calculated from x and y
+        out_x, out_y: Preallocated arrays of length N for the result. If None, new floating point arrays are allocated
     
     Returns:
-        DataFrame with scaled coordinates
+        Tuple of arrays with scaled X and Y coordinates
     """
-    # Make a copy of the dataframe to avoid modifying the original
-    result_df = df.copy()
-    
+    # Accept any array-like coordinates, computing in floating point
+    x, y = _as_float(x, y)
+
     # Calculate centroid
-    centroid_x = result_df['X'].mean()
-    centroid_y = result_df['Y'].mean()
+    cx, cy = (x.mean(dtype=np.float64), y.mean(dtype=np.float64)) if centroid is None else centroid
 
-    # Scale the plot
-    result_df['X_scaled'] = centroid_x + (result_df['X'] - centroid_x) * scale_factor
-    result_df['Y_scaled'] = centroid_y + (result_df['Y'] - centroid_y) * scale_factor
-    
-    return result_df
+    # Scale the plot about the centroid, working in place in the output buffers
+    if out_x is None:
+        out_x = np.empty_like(x)
+    if out_y is None:
+        out_y = np.empty_like(y)
+    for coords, c, out in ((x, cx, out_x), (y, cy, out_y)):
+        np.subtract(coords, c, out=out)
+        np.multiply(out, scale_factor, out=out)
+        np.add(out, c, out=out)
+    return out_x, out_y
@@ -1,7 +1,13 @@
-import pandas as pd
-from plot import Plotting
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import matplotlib.pyplot as plt
+from plot import Plotting, TASKS
 
 if __name__ == '__main__': 
-    df = pd.read_csv(filepath_or_buffer='Aerofoil.csv', sep=';')
-    task_list = ['Task 1: Twist by Leading Edge', 'Task 2: Scale', 'Task 3: Twist by Centroid']
-    plot_airfoil = Plotting(df=df, task_list=task_list)
\ No newline at end of file
+    # Load the data in the background while the figure is created on the main thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(np.loadtxt, fname='Aerofoil.csv', delimiter=';', skiprows=1, dtype=np.float32, unpack=True)
+        fig = plt.figure(figsize=(12, 8))
+        x, y = future.result()
+    task_list = list(TASKS)
+    plot_airfoil = Plotting(x=x, y=y, task_list=task_list, fig=fig)
\ No newline at end of file
@@ -1,127 +1,292 @@
 """Contains functions for plotting the airfoil data."""
 
+from collections import OrderedDict, namedtuple
+from enum import IntEnum
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.transforms import Bbox
 from matplotlib.widgets import RadioButtons, Slider
 from airfoil import twist_airfoil_ledge, twist_airfoil_centroid, scale_airfoil
 
+# Minimum time between two slider redraws in milliseconds (~60 Hz)
+REDRAW_INTERVAL_MS = 16
+# Twist angles are rounded to this resolution in degrees, so revisited angles hit the cache
+TWIST_RESOLUTION = 0.25
+# Number of twisted airfoils kept in the cache, each one a preallocated buffer row
+TWIST_CACHE_SIZE = 64
+# Slider ranges of the twist angle in degrees and of the scale factor
+ANGLE_RANGE = (-180, 180)
+SCALE_RANGE = (0.1, 2.0)
+# Padding around the transformed airfoil's extent, as a fraction of its width and height
+LIMIT_MARGIN = 0.05
+
+class Task(IntEnum):
+    """Transformation tasks which can be selected with the radio buttons."""
+    TWIST_LEDGE = 0
+    SCALE = 1
+    TWIST_CENTROID = 2
+
+# Radio button label of each task
+TASKS = {
+    'Task 1: Twist by Leading Edge': Task.TWIST_LEDGE,
+    'Task 2: Scale': Task.SCALE,
+    'Task 3: Twist by Centroid': Task.TWIST_CENTROID,
+}
+
+# Static setup of a task: slider (label, valmin, valmax, valinit, valstep), reference point (None to hide) and axis limits
+TaskView = namedtuple('TaskView', ['slider', 'ref_point', 'limits'])
+
 class Plotting():
-    def __init__(self, df, task_list) -> None:
-        self.df = df
+    def __init__(self, x, y, task_list, fig=None) -> None:
+        unknown_tasks = [task for task in task_list if task not in TASKS]
+        if unknown_tasks:
+            raise ValueError(f'Unknown tasks {unknown_tasks}, expected labels from {list(TASKS)}')
         self.task_list = task_list
-        # Create the main figure
-        fig = plt.figure(figsize=(12, 8))
+        # Cache the coordinates once as separate contiguous float32 arrays, plenty for plotting, and their centroid
+        self._x = np.ascontiguousarray(x, dtype=np.float32)
+        self._y = np.ascontiguousarray(y, dtype=np.float32)
+        self._centroid = (float(self._x.mean(dtype=np.float64)), float(self._y.mean(dtype=np.float64)))
+        # Precompute the static setup of each task. The axis limits fit every slider position,
+        # so the view never has to be rescaled while dragging.
+        self._task_views = {
+            Task.TWIST_LEDGE: TaskView(slider=('Angle Twist', *ANGLE_RANGE, 0, TWIST_RESOLUTION), ref_point=(0.0, 0.0),
+                                       limits=self._circle_limits(center=(0.0, 0.0))),
+            Task.SCALE: TaskView(slider=('Scale Factor', *SCALE_RANGE, 1.0, None), ref_point=None,
+                                 limits=self._scaled_limits(scale_factor=max(SCALE_RANGE[1], 1.0))),
+            Task.TWIST_CENTROID: TaskView(slider=('Angle Twist', *ANGLE_RANGE, 0, TWIST_RESOLUTION), ref_point=self._centroid,
+                                          limits=self._circle_limits(center=self._centroid)),
+        }
+        # Function redrawing the transformed airfoil of each task for the current slider value
+        self._task_plots = {
+            Task.TWIST_LEDGE: lambda: self.plot_twisted_airfoil(angle_degrees=self._slider.val, ledge=True, centroid=False),
+            Task.SCALE: lambda: self.plot_scale_airfoil(scale_factor=self._slider.val),
+            Task.TWIST_CENTROID: lambda: self.plot_twisted_airfoil(angle_degrees=self._slider.val, ledge=False, centroid=True),
+        }
+        # Cache twisted coordinates by angle, the slider keeps revisiting the same angles while dragging.
+        # The cache is an LRU over preallocated rows, so evicted entries reuse their buffers.
+        self._twist_cache = OrderedDict()
+        self._free_twist_rows = list(range(TWIST_CACHE_SIZE))
+        self._twist_x = np.empty(shape=(TWIST_CACHE_SIZE, len(self._x)), dtype=self._x.dtype)
+        self._twist_y = np.empty(shape=(TWIST_CACHE_SIZE, len(self._y)), dtype=self._y.dtype)
+        # Output buffers for the scaled coordinates, reused on every slider tick
+        self._out_x = np.empty_like(self._x)
+        self._out_y = np.empty_like(self._y)
+        # Create the main figure, or make the given one current
+        self.fig = plt.figure(figsize=(12, 8)) if fig is None else plt.figure(num=fig)
+        # Blit slider updates where the canvas supports it, otherwise redraw the whole figure
+        self._blit = self.fig.canvas.supports_blit
         
         # Create main plot area with radio buttons
         self.ax = plt.axes(arg=[0.1, 0.1, 0.7, 0.8])  
-        rax = plt.axes(arg=[0.85, 0.85, 0.15, 0.15], frameon=False)  
-        radio = RadioButtons(ax=rax, labels=self.task_list)
-        radio.on_clicked(func=self.update_plot)
-
-        # Create sliders
-        self.ax_angle = plt.axes([0.85, 0.2, 0.03, 0.6])
-        self.angle_slider = Slider(ax=self.ax_angle, label='Angle Twist', valmin=-180, valmax=180, valinit=0, orientation='vertical')
-        self.angle_slider.set_active(True)
+        self.rax = plt.axes(arg=[0.85, 0.85, 0.15, 0.15], frameon=False)  
+        self.radio = RadioButtons(ax=self.rax, labels=self.task_list, useblit=self._blit)
+        self.radio.on_clicked(func=self.update_plot)
+
+        # Create a single slider axes shared by all tasks, the slider in it is rebuilt for the range of each task
+        self.ax_slider = plt.axes([0.85, 0.2, 0.03, 0.6])
+        self._slider = None
+        self._slider_artists = ()
+        # Last slider value of each slider label, restored when switching back to a task using it
+        self._slider_values = {}
+
+        # Create the plot artists once, slider changes only update their data
+        self._orig_line, = self.ax.plot(self._x, self._y, 'b-', linewidth=2, label='Original')
+        self._trans_line, = self.ax.plot([], [], 'r--', linewidth=2, label=' ')
+        self._ref_point, = self.ax.plot([], [], 'ko', markersize=6)
         
-        self.ax_scale = plt.axes([0.85, 0.2, 0.03, 0.6])
-        self.scale_slider = Slider(ax=self.ax_scale, label='Scale Factor', valmin=0.1, valmax=2.0, valinit=0, orientation='vertical')
-        self.scale_slider.set_active(False)
+        # Setup plot
+        self.ax.grid(visible=True, linestyle='--')
+        self.ax.set_xlabel(xlabel='X', fontsize=12)
+        self.ax.set_ylabel(ylabel='Y', fontsize=12)
+        # Keep the limits set for each task and fit the axes box to them instead, so no transformed airfoil is clipped
+        self.ax.set_aspect(aspect='equal', adjustable='box')
+        self._legend = self.ax.legend()
+
+        # Artists which change on every slider tick are left out of the background and blitted on top of it.
+        # Canvases which cannot blit keep them as normal artists and redraw the whole figure instead.
+        self._backgrounds = None
+        if self._blit:
+            for artist in (self._trans_line, self.ax.title, self._legend):
+                artist.set_animated(True)
+            self.fig.canvas.mpl_connect('draw_event', self._on_draw)
 
-        # Update plot when sliders are changed
-        self.angle_slider.on_changed(func=lambda _: self.update_plot(task=radio.value_selected))
-        self.scale_slider.on_changed(func=lambda _: self.update_plot(task=radio.value_selected))
+        # Update plot when the slider is changed. Slider events fire on every mouse move,
+        # so they only schedule a redraw and the timer coalesces them.
+        self._redraw_pending = False
+        self._redraw_timer = self.fig.canvas.new_timer(interval=REDRAW_INTERVAL_MS)
+        self._redraw_timer.single_shot = True
+        self._redraw_timer.add_callback(self._flush_redraw)
 
         # Show initial plot (Task 1 by default)
         self.update_plot(task=self.task_list[0])
         plt.show()
 
-    def plot_twisted_airfoil(self, df, angle_degrees, ledge=True, centroid=False) -> None:
+    def _twist(self, angle_degrees, ledge):
         """
-        Plot the original and twisted airfoil
+        Twist the airfoil coordinates, reusing the cached result if this angle was twisted recently.
         
         Args:
-            df: pandas DataFrame with X and Y coordinates
-            angle_degrees: Angle of twist in degrees
+            angle_degrees: Angle of twist in degrees, rounded to TWIST_RESOLUTION
             ledge: If True, twist about the leading edge. If False, twist about the centroid
-            centroid: If True, twist about the centroid. If False, twist about the leading edge
-        """
-        plt.sca(self.ax)  # Set the main axes as current
-        plt.cla()            # Clear the main axes only
         
-        # Apply twist
-        if ledge:
-            result_df = twist_airfoil_ledge(df=df, angle_degrees=angle_degrees)
-        else:
-            result_df = twist_airfoil_centroid(df=df, angle_degrees=angle_degrees)
-        
-        # Plot original airfoil 
-        plt.plot(result_df['X'], result_df['Y'], 'b-', linewidth=2, label='Original')
+        Returns:
+            Tuple of arrays with twisted X and Y coordinates, views into the cache buffers
+        """
+        key = (angle_degrees, ledge)
+        row = self._twist_cache.get(key)
+        if row is not None:
+            self._twist_cache.move_to_end(key)
+            return self._twist_x[row], self._twist_y[row]
         
-        # Plot twisted airfoil
-        plt.plot(result_df['X_twisted'], result_df['Y_twisted'], 'r--', linewidth=2, 
-                label=f'Twisted ({angle_degrees}°)')
+        # Take a free row, or the one of the least recently used angle once the cache is full
+        row = self._free_twist_rows.pop() if self._free_twist_rows else self._twist_cache.popitem(last=False)[1]
+        try:
+            if ledge:
+                result = twist_airfoil_ledge(x=self._x, y=self._y, angle_degrees=angle_degrees,
+                                             out_x=self._twist_x[row], out_y=self._twist_y[row])
+            else:
+                result = twist_airfoil_centroid(x=self._x, y=self._y, angle_degrees=angle_degrees, centroid=self._centroid,
+                                                out_x=self._twist_x[row], out_y=self._twist_y[row])
+        except Exception:
+            # Hand the row back rather than caching a key for coordinates which were never computed
+            self._free_twist_rows.append(row)
+            raise
+        self._twist_cache[key] = row
+        return result
+
+    def plot_twisted_airfoil(self, angle_degrees, ledge=True, centroid=False) -> None:
+        """
+        Update the twisted airfoil
         
-        # Add reference point at the leading edge
-        if ledge:
-            plt.plot(0, 0, 'ko', markersize=6)
-        else:
-            plt.plot(result_df['X'].mean(), result_df['Y'].mean(), 'ko', markersize=6)
+        Args:
+            angle_degrees: Angle of twist in degrees
+            ledge: If True, twist about the leading edge. If False, twist about the centroid
+            centroid: If True, twist about the centroid. If False, twist about the leading edge
+        """
+        # Apply twist. The angle slider already steps by TWIST_RESOLUTION, round anyway so the cache key always matches.
+        angle_degrees = round(angle_degrees / TWIST_RESOLUTION) * TWIST_RESOLUTION
+        x_twisted, y_twisted = self._twist(angle_degrees, ledge)
         
-        # Setup plot
-        plt.grid(visible=True, linestyle='--')
-        plt.xlabel(xlabel='X', fontsize=12)
-        plt.ylabel(ylabel='Y', fontsize=12)
-        plt.title(label=f'Airfoil twisted by {angle_degrees}° about its leading edge', fontsize=14)
-        plt.axis('equal')
-        plt.legend()
-
-    def plot_scale_airfoil(self, df, scale_factor) -> None:
+        # Update twisted airfoil
+        self._trans_line.set_data(x_twisted, y_twisted)
+        self._legend.get_texts()[1].set_text(f'Twisted ({angle_degrees}°)')
+        self.ax.set_title(label=f'Airfoil twisted by {angle_degrees}° about its {"leading edge" if ledge else "centroid"}', fontsize=14)
+
+    def plot_scale_airfoil(self, scale_factor) -> None:
         """
-        Plot the original and scaled airfoil.
+        Update the scaled airfoil.
         
         Args:
-            df: pandas DataFrame with X and Y coordinates
             scale_factor: Factor to scale the airfoil by
         """
-        plt.sca(self.ax)  # Set the main axes as current
-        plt.cla()       # Clear the main axes only
-        
         # Apply scale
-        result_df = scale_airfoil(df, scale_factor)
-        
-        # Plot original airfoil 
-        plt.plot(result_df['X'], result_df['Y'], 'b-', linewidth=2, label='Original')
+        x_scaled, y_scaled = scale_airfoil(x=self._x, y=self._y, scale_factor=scale_factor, centroid=self._centroid,
+                                           out_x=self._out_x, out_y=self._out_y)
         
-        # Plot scaled airfoil
-        plt.plot(result_df['X_scaled'], result_df['Y_scaled'], 'r--', linewidth=2, 
-                label=f'Scaled (Factor = {scale_factor})')
-        
-        # Setup plot
-        plt.grid(visible=True, linestyle='--')
-        plt.xlabel(xlabel='X', fontsize=12)
-        plt.ylabel(ylabel='Y', fontsize=12)
-        plt.title(label=f'Airfoil scaled by factor of {scale_factor}', fontsize=14)
-        plt.axis('equal')
-        plt.legend()
+        # Update scaled airfoil
+        self._trans_line.set_data(x_scaled, y_scaled)
+        self._legend.get_texts()[1].set_text(f'Scaled (Factor = {scale_factor})')
+        self.ax.set_title(label=f'Airfoil scaled by factor of {scale_factor}', fontsize=14)
 
     def update_plot(self, task) -> None:
-        plt.sca(self.ax)
-        plt.cla()
-        if task == 'Task 1: Twist by Leading Edge':
-            self.ax_angle.set_visible(True)
-            self.angle_slider.set_active(True)
-            self.ax_scale.set_visible(False)
-            self.scale_slider.set_active(False)
-            self.plot_twisted_airfoil(df=self.df, angle_degrees=self.angle_slider.val, ledge=True, centroid=False)
-        elif task == 'Task 2: Scale':
-            self.ax_angle.set_visible(False)
-            self.angle_slider.set_active(False)
-            self.ax_scale.set_visible(True)
-            self.scale_slider.set_active(True)
-            self.plot_scale_airfoil(df=self.df, scale_factor=self.scale_slider.val)
+        self._task = TASKS[task]
+        view = self._task_views[self._task]
+        self._configure_slider(*view.slider)
+        # Add reference point at the rotation center
+        if view.ref_point is None:
+            self._ref_point.set_visible(False)
         else:
-            self.ax_angle.set_visible(True)
-            self.angle_slider.set_active(True)
-            self.ax_scale.set_visible(False)
-            self.scale_slider.set_active(False)
-            self.plot_twisted_airfoil(df=self.df, angle_degrees=self.angle_slider.val, ledge=False, centroid=True)
-        plt.draw()
+            self._ref_point.set_data([view.ref_point[0]], [view.ref_point[1]])
+            self._ref_point.set_visible(True)
+        self._set_limits(*view.limits)
+        self._task_plots[self._task]()
+        # Switching task changes the static parts of the figure, so do a full redraw
+        self.fig.canvas.draw_idle()
+
+    def redraw(self) -> None:
+        """Update the transformed airfoil for the current slider value and blit it onto the figure."""
+        self._task_plots[self._task]()
+        
+        # Fall back to a full redraw if blitting is not possible
+        if not self._blit or self._backgrounds is None:
+            self.fig.canvas.draw_idle()
+            return
+        
+        for background in self._backgrounds:
+            self.fig.canvas.restore_region(background)
+        self._draw_animated()
+        for region in self._blit_regions():
+            self.fig.canvas.blit(region)
+
+    def _circle_limits(self, center):
+        """Axis limits (xmin, xmax, ymin, ymax) of the circle swept by the airfoil when twisted a full turn about center."""
+        cx, cy = center
+        radius = float(np.hypot(self._x - cx, self._y - cy).max())
+        return cx - radius, cx + radius, cy - radius, cy + radius
+
+    def _scaled_limits(self, scale_factor):
+        """Axis limits (xmin, xmax, ymin, ymax) of the airfoil scaled about its centroid by scale_factor."""
+        cx, cy = self._centroid
+        half_width = max(cx - self._x.min(), self._x.max() - cx) * scale_factor
+        half_height = max(cy - self._y.min(), self._y.max() - cy) * scale_factor
+        return cx - half_width, cx + half_width, cy - half_height, cy + half_height
+
+    def _set_limits(self, xmin, xmax, ymin, ymax) -> None:
+        # Pad the precomputed extent like the default axes margins
+        xmargin, ymargin = LIMIT_MARGIN*(xmax - xmin), LIMIT_MARGIN*(ymax - ymin)
+        self.ax.set_xlim(left=xmin - xmargin, right=xmax + xmargin)
+        self.ax.set_ylim(bottom=ymin - ymargin, top=ymax + ymargin)
+
+    def _configure_slider(self, label, valmin, valmax, valinit, valstep) -> None:
+        """Rebuild the shared slider for the selected task, restoring its last value for that label."""
+        if self._slider is not None:
+            self._slider_values[self._slider.label.get_text()] = self._slider.val
+            self._slider.disconnect_events()
+            self.ax_slider.clear()
+            self._slider_artists = ()
+        # The slider is redrawn by blitting together with the plot, so turn off its own redraw
+        self._slider = Slider(ax=self.ax_slider, label=label, valmin=valmin, valmax=valmax, valinit=valinit,
+                              valstep=valstep, orientation='vertical')
+        self._slider.drawon = False
+        # Move the slider to its last value without triggering another redraw
+        self._slider.eventson = False
+        self._slider.set_val(self._slider_values.get(label, valinit))
+        self._slider.eventson = True
+        self._slider.on_changed(func=lambda _: self._schedule_redraw())
+        # The filled bar, the handle and the value text move; the track and label stay in the background.
+        # The initial value marker is drawn with them so the bar does not cover it.
+        self._slider_artists = (self._slider.poly, *self.ax_slider.lines, self._slider.valtext)
+        if self._blit:
+            for artist in self._slider_artists:
+                artist.set_animated(True)
+
+    def _schedule_redraw(self) -> None:
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self._redraw_timer.start()
+
+    def _flush_redraw(self) -> None:
+        # Redraw once with the latest slider value, however many events arrived in between
+        self._redraw_pending = False
+        self.redraw()
+
+    def _animated_artists(self):
+        return (self._trans_line, self.ax.title, self._legend, *self._slider_artists)
+
+    def _blit_regions(self):
+        # Everything left of the radio buttons, and the slider column below them. The radio buttons blit
+        # themselves, so restoring a background over them would erase their state.
+        fig, rax = self.fig.bbox, self.rax.bbox
+        return (Bbox.from_extents(fig.x0, fig.y0, rax.x0, fig.y1), Bbox.from_extents(rax.x0, fig.y0, fig.x1, rax.y0))
+
+    def _draw_animated(self) -> None:
+        for artist in self._animated_artists():
+            self.fig.draw_artist(artist)
+
+    def _on_draw(self, event) -> None:
+        # Saving renders the animated artists itself and may use a canvas which cannot blit
+        if self.fig.canvas.is_saving():
+            return
+        # Capture the static background after every full redraw, then paint the animated artists on top
+        self._backgrounds = [self.fig.canvas.copy_from_bbox(region) for region in self._blit_regions()]
+        self._draw_animated()